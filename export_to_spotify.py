@@ -1,14 +1,34 @@
 import json
 import csv
+import codecs
 import os
 import re
 import time
+import sqlite3
+import threading
 import argparse
+import atexit
 import datetime
 import sys
+import functools
+import collections
+from concurrent.futures import Future, ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 from dotenv import load_dotenv
+from fast_parse import SPOTIFY_TRACK_RE as _SPOTIFY_TRACK_RE, Track, parse_lines
+
+try:
+    import orjson  # Optional: much faster JSON serialization when installed
+except ImportError:
+    orjson = None
+
+try:
+    import charset_normalizer  # Optional: sniff the input encoding from a small sample
+except ImportError:
+    charset_normalizer = None
 
 # -----------------------------
 # CONFIGURATION (load from environment / .env)
@@ -25,6 +45,14 @@ MISSING_TRACKS_FILE = os.getenv("MISSING_TRACKS_FILE", "missing_tracks.csv")
 JSON_EXPORT_FILE = os.getenv("JSON_EXPORT_FILE", "playlist_export.json")
 RATE_LIMIT_LOG = os.getenv("RATE_LIMIT_LOG", "rate_limit_events.jsonl")
 STOP_ON_FIRST_RATE_LIMIT = os.getenv("STOP_ON_FIRST_RATE_LIMIT", "true").lower() in ("1", "true", "yes")
+SEARCH_CONCURRENCY = max(1, int(os.getenv("SEARCH_CONCURRENCY", "10")))  # Parallel track searches
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "50000"))  # In-memory search results kept per run
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "64"))  # Keep-alive connections to the Spotify API
+TRACK_CACHE_FILE = os.getenv("TRACK_CACHE_FILE", "track_cache.db")  # Persistent search results; empty disables
+SPOTIFY_RATE = float(os.getenv("SPOTIFY_RATE", "10"))  # Sustained API requests per second; 0 disables throttling
+SPOTIFY_BURST = int(os.getenv("SPOTIFY_BURST", "20"))  # Requests allowed back-to-back before throttling kicks in
+ADD_CONCURRENCY = max(1, int(os.getenv("ADD_CONCURRENCY", "4")))  # Playlists being filled at once
+PROGRESS_INTERVAL = 100  # Tracks between progress lines when not verbose
 
 # -----------------------------
 # STEP 1: Parse CSV Export
@@ -32,64 +60,148 @@ STOP_ON_FIRST_RATE_LIMIT = os.getenv("STOP_ON_FIRST_RATE_LIMIT", "true").lower()
 def parse_playlist_export(file_path, delimiter=None, return_meta=False):
     """Parse the CSV export file into a dict of playlists.
 
-    This function attempts to read the input file using several common
+    The encoding is sniffed from the start of the file with charset_normalizer
+    when available, and the file is streamed row by row rather than loaded
+    into memory. If sniffing is unavailable or turns out wrong, this
+    function attempts to read the input file using several common
     encodings to avoid UnicodeDecodeError on files produced on Windows
     or with legacy encodings. If necessary it will fall back to UTF-8
     with errors='replace' so the script can continue and bad characters
     are replaced.
     """
-    def _read_lines_with_fallback(path):
+    def _parse_handle(fh):
+        # Plain str.split per line: quotes have no special meaning in the
+        # export format, and it is markedly faster than csv.reader here
+        with fh:
+            return parse_lines(fh, delimiter)
+
+    def _parse_with_fallback(path, tried=()):
         encodings = ["utf-8", "cp1252", "latin-1"]
         for enc in encodings:
+            if enc in tried:
+                # already failed to decode the whole file
+                continue
             try:
-                with open(path, "r", encoding=enc) as fh:
-                    return fh.readlines(), enc, False
+                # Parse directly; a decode error means the encoding was wrong
+                return _parse_handle(_open_text(path, enc)), enc, False
             except UnicodeDecodeError:
                 # try next encoding
                 continue
-            except Exception:
-                # other I/O errors should propagate
-                raise
 
         # Last resort: read with utf-8 but replace invalid bytes so we don't crash
-        with open(path, "r", encoding="utf-8", errors="replace") as fh:
-            print(f"Warning: input file {path} contained undecodable bytes; some characters were replaced.")
-            return fh.readlines(), "utf-8-replace", True
-
-    playlists = {}
-    lines, used_encoding, replaced = _read_lines_with_fallback(file_path)
+        print(f"Warning: input file {path} contained undecodable bytes; some characters were replaced.")
+        return _parse_handle(_open_text(path, "utf-8", errors="replace")), "utf-8-replace", True
 
     # Determine delimiter: use explicit parameter, then environment, then default to ';'
     if delimiter is None:
         delimiter = os.getenv("INPUT_DELIMITER", ";")
 
-    for line in lines:
-        parts = [p.strip() for p in line.split(delimiter)]
-        if len(parts) == 4:
-            playlist_name, title, artist, album = parts
-            if playlist_name not in playlists:
-                playlists[playlist_name] = []
-            playlists[playlist_name].append({
-                "title": title,
-                "artist": artist,
-                "album": album
-            })
+    # Guess the encoding from a small sample instead of trial-decoding the
+    # whole file once per candidate encoding
+    sniffed = _sniff_encoding(file_path) if charset_normalizer is not None else None
+
+    playlists = None
+    replaced = False
+    if sniffed is not None:
+        try:
+            playlists = _parse_handle(_open_text(file_path, sniffed))
+            used_encoding = sniffed
+        except UnicodeDecodeError:
+            # The sample was not representative of the rest of the file
+            playlists = None
+
+    if playlists is None:
+        tried = (sniffed,) if sniffed is not None else ()
+        playlists, used_encoding, replaced = _parse_with_fallback(file_path, tried)
     if return_meta:
         meta = {"encoding": used_encoding, "replaced": replaced, "delimiter": delimiter, "playlists_count": len(playlists)}
         return playlists, meta
     return playlists
 
+
+def _open_text(path, encoding, errors="strict"):
+    """Open the export for parsing. UTF-8 is read as utf-8-sig so a BOM
+    (common in Windows/Excel exports) does not end up in the first playlist name."""
+    if encoding == "utf-8":
+        encoding = "utf-8-sig"
+    return open(path, "r", encoding=encoding, errors=errors)
+
+
+# Encodings the sniffer may pick, mapped to the names used by the fallback
+# path. Other guesses (e.g. cp1250 for a cp1252 file) are too easily wrong.
+_SNIFF_ENCODINGS = {"utf-8": "utf-8", "ascii": "utf-8", "cp1252": "cp1252", "iso8859-1": "latin-1"}
+_SNIFF_BYTES = 64 * 1024
+
+
+def _sniff_encoding(path):
+    """Guess the encoding of `path` from its first 64 KB, or return None."""
+    with open(path, "rb") as fh:
+        head = fh.read(_SNIFF_BYTES)
+    if len(head) == _SNIFF_BYTES:
+        # Don't cut a multi-byte character in half at the end of the sample
+        head = head[:head.rfind(b"\n") + 1] or head
+    # Matches are ordered from most to least likely
+    for match in charset_normalizer.from_bytes(head):
+        name = _SNIFF_ENCODINGS.get(codecs.lookup(match.encoding).name)
+        if name:
+            return name
+    return None
+
+
+# Older name kept for callers written against the music-app export script
+parse_music_export = parse_playlist_export
+
+
+def _track_to_dict(track):
+    data = track._asdict()
+    # Only rows that came with a URI column carry one; keep the export compact
+    if not data["spotify_uri"]:
+        del data["spotify_uri"]
+    return data
+
+
+def serialize_playlists(playlists):
+    """Convert parsed playlists into plain dicts suitable for JSON export."""
+    return {name: [_track_to_dict(track) for track in tracks] for name, tracks in playlists.items()}
+
+
+def write_json_export(playlists, path):
+    """Write parsed playlists to `path` as indented JSON."""
+    data = serialize_playlists(playlists)
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
 # -----------------------------
 # STEP 2: Spotify Authentication
 # -----------------------------
 def authenticate_spotify():
-    return spotipy.Spotify(auth_manager=SpotifyOAuth(
+    sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
         client_id=CLIENT_ID,
         client_secret=CLIENT_SECRET,
         redirect_uri=REDIRECT_URI,
         scope=SCOPE
     ))
 
+    # spotipy's session keeps only 10 pooled connections per host, so concurrent
+    # searches beyond that would open (and TLS-handshake) throwaway connections.
+    # Remount with a larger keep-alive pool, preserving spotipy's retry policy.
+    session = getattr(sp, "_session", None)
+    if isinstance(session, requests.Session):
+        retry = session.get_adapter("https://").max_retries
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+        session.mount("https://", adapter)
+    return sp
+
+
+# Precompiled patterns for the rate-limit path
+_RETRY_AFTER_RE = re.compile(r"retry-?after\D*(\d+)", re.I)
+_HTTP_429_RE = re.compile(r"\b429\b")
+_RETRY_AFTER_HEADERS = ("Retry-After", "retry-after")
+
 
 def _get_retry_after_from_exception(exc):
     """Try to extract a Retry-After value (seconds) from a Spotify/requests exception.
@@ -104,7 +216,7 @@ def _get_retry_after_from_exception(exc):
         headers = exc.response.headers
 
     if headers:
-        for key in ("Retry-After", "retry-after"):
+        for key in _RETRY_AFTER_HEADERS:
             if key in headers:
                 try:
                     return int(headers[key])
@@ -118,7 +230,7 @@ def _get_retry_after_from_exception(exc):
         return None
 
     # Try to find a "Retry-After: <seconds>" in the string representation
-    m = re.search(r"retry-?after\D*(\d+)", str(exc), flags=re.I)
+    m = _RETRY_AFTER_RE.search(str(exc))
     if m:
         try:
             return int(m.group(1))
@@ -128,10 +240,71 @@ def _get_retry_after_from_exception(exc):
     return None
 
 
+class TokenBucket:
+    """Thread-safe token bucket used to pace requests before they are sent.
+
+    Tokens refill at `rate` per second up to `burst`. Each observed rate limit
+    halves the rate via throttle(), at most once per throttle window so that a
+    burst of 429s seen by concurrent workers counts as one; the rate then
+    recovers by 10% of the configured rate per minute. A rate of 0 disables
+    limiting.
+    """
+
+    def __init__(self, rate, burst):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.throttled_at = float("-inf")
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * 0.1 * elapsed / 60)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        if self.base_rate <= 0:
+            return
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, window=1.0):
+        """Halve the request rate after the server reported a rate limit.
+
+        Further calls within `window` seconds of the last halving are ignored:
+        they are most likely the same rate limit hitting other threads.
+        """
+        if self.base_rate <= 0:
+            return
+        with self.lock:
+            self._refill()
+            if self.updated - self.throttled_at < window:
+                return
+            self.throttled_at = self.updated
+            self.rate = max(self.rate / 2, self.base_rate / 64)
+
+
+_rate_limiter = TokenBucket(SPOTIFY_RATE, SPOTIFY_BURST)
+
+
 def spotify_call(func, *args, max_retries=5, backoff_factor=1, **kwargs):
     """Call a Spotify API function and respect rate limit (HTTP 429) responses.
 
-    If a 429 is encountered, this will sleep for the server-provided Retry-After
+    Requests are paced by a client-side token bucket so bursts are smoothed out
+    before Spotify has to reject them. If a 429 is encountered anyway, the
+    bucket slows down and this will sleep for the server-provided Retry-After
     seconds when available, otherwise use exponential backoff. After max_retries
     it will re-raise the last exception.
     """
@@ -144,6 +317,7 @@ def spotify_call(func, *args, max_retries=5, backoff_factor=1, **kwargs):
             if "_rl_context" in kwargs:
                 rl_context = kwargs.pop("_rl_context")
 
+            _rate_limiter.acquire()
             return func(*args, **kwargs)
         except Exception as exc:
             attempt += 1
@@ -157,9 +331,14 @@ def spotify_call(func, *args, max_retries=5, backoff_factor=1, **kwargs):
             else:
                 # Look for HTTP 429 hint in exception attributes or text
                 status = getattr(exc, "http_status", None) or getattr(exc, "status", None)
-                if status == 429 or re.search(r"\b429\b", str(exc)):
+                if status == 429 or _HTTP_429_RE.search(str(exc)):
                     is_rate_limit = True
 
+            if is_rate_limit:
+                # Debounce over the Retry-After period so requests already in
+                # flight when the limit hit don't halve the rate again
+                _rate_limiter.throttle(window=max(1.0, retry_after or 0))
+
             if not is_rate_limit or attempt > max_retries:
                 # Not a rate-limit or we've retried enough
                 raise
@@ -167,7 +346,7 @@ def spotify_call(func, *args, max_retries=5, backoff_factor=1, **kwargs):
             # Log the rate-limit event for analysis
             try:
                 event = {
-                    "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+                    "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="microseconds").replace("+00:00", "Z"),
                     "function": getattr(func, "__name__", str(func)),
                     "args_summary": _summarize_args(args, kwargs),
                     "attempt": attempt,
@@ -224,20 +403,44 @@ def _summarize_args(args, kwargs):
         return {"args": [], "kwargs": {}}
 
 
+# Open rate-limit log handles by path, reused for the whole run
+_rate_log_files = {}
+_rate_log_lock = threading.Lock()
+
+
 def _log_rate_limit_event(event, file_path=None):
     """Append a JSON line with the rate-limit event to the configured file."""
     if file_path is None:
         file_path = RATE_LIMIT_LOG
-    # Ensure directory exists
-    try:
-        dirp = os.path.dirname(file_path)
-        if dirp:
-            os.makedirs(dirp, exist_ok=True)
-    except Exception:
-        pass
 
-    with open(file_path, "a", encoding="utf-8") as fh:
-        fh.write(json.dumps(event, ensure_ascii=False) + "\n")
+    if orjson is not None:
+        line = orjson.dumps(event).decode("utf-8")
+    else:
+        line = json.dumps(event, ensure_ascii=False)
+
+    with _rate_log_lock:
+        fh = _rate_log_files.get(file_path)
+        if fh is None:
+            # Ensure directory exists
+            try:
+                dirp = os.path.dirname(file_path)
+                if dirp:
+                    os.makedirs(dirp, exist_ok=True)
+            except Exception:
+                pass
+            fh = open(file_path, "a", encoding="utf-8")
+            _rate_log_files[file_path] = fh
+        fh.write(line + "\n")
+        # Flush so the event survives the run being stopped right after it
+        fh.flush()
+
+
+@atexit.register
+def _close_rate_limit_logs():
+    with _rate_log_lock:
+        for fh in _rate_log_files.values():
+            fh.close()
+        _rate_log_files.clear()
 
 
 class RateLimitCaptured(Exception):
@@ -247,68 +450,348 @@ class RateLimitCaptured(Exception):
 # -----------------------------
 # STEP 3: Track Search Logic
 # -----------------------------
+# Placeholder values the export uses for missing metadata (after normalization)
+_UNKNOWN_VALUES = frozenset({"", "unknown"})
+
+
+def _track_key(title, artist):
+    """Normalize a (title, artist) pair so equivalent queries share a cache entry."""
+    return (title or "").lower().strip(), (artist or "").lower().strip()
+
+
+def _uri_from_text(*values):
+    """Return a spotify:track URI embedded in any of `values`, or None."""
+    for value in values:
+        if value:
+            m = _SPOTIFY_TRACK_RE.search(value)
+            if m:
+                return "spotify:track:" + (m.group(1) or m.group(2))
+    return None
+
+
 def search_track(sp, title, artist=None):
-    if not title or title.lower() == "unknown":
+    # Exports from Spotify-sourced libraries may already carry the URI
+    uri = _uri_from_text(title)
+    if uri:
+        return uri
+
+    return _search_normalized(sp, *_track_key(title, artist))
+
+
+def _search_normalized(sp, title_key, artist_key):
+    """Search for a track given keys already normalized by _track_key."""
+    if title_key in _UNKNOWN_VALUES:
         return None
+    if artist_key in _UNKNOWN_VALUES:
+        artist_key = ""
 
-    query = f'track:{title}' + (f' artist:{artist}' if artist and artist.lower() != "unknown" else "")
     try:
-        result = spotify_call(sp.search, q=query, type="track", limit=1)
-        if result["tracks"]["items"]:
-            return result["tracks"]["items"][0]["uri"]
-
-        # Fallback: search by title only
-        fallback_result = spotify_call(sp.search, q=f'track:{title}', type="track", limit=1)
-        if fallback_result["tracks"]["items"]:
-            return fallback_result["tracks"]["items"][0]["uri"]
+        return _search_track_cached(sp, title_key, artist_key)
     except Exception as e:
-        print(f"Error searching track '{title}': {e}")
+        print(f"Error searching track '{title_key}': {e}")
     return None
 
+
+@functools.lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def _search_track_cached(sp, title, artist):
+    """Resolve a normalized (title, artist) pair to a track URI, or None.
+
+    `artist` is empty when the export did not know it.
+
+    Exports often repeat the same song across playlists, so results (including
+    misses) are memoized for the lifetime of the process. Exceptions are not
+    cached, so a failed lookup is retried the next time it is requested.
+    Successful lookups are also persisted to the on-disk track cache when one
+    is open, so later runs can skip the API entirely.
+    """
+    key = f"{title}\x1f{artist}"
+    uri = _track_cache_get(key)
+    if uri:
+        return uri
+
+    # Build the title filter once; it is also the complete fallback query
+    title_query = f"track:{title}"
+    parts = [title_query]
+    if artist:
+        parts.append(f"artist:{artist}")
+    query = " ".join(parts)
+
+    result = spotify_call(sp.search, q=query, type="track", limit=1)
+    if result["tracks"]["items"]:
+        uri = result["tracks"]["items"][0]["uri"]
+    elif artist:
+        # Fallback: search by title only. Without an artist the primary query
+        # was already title-only, so there is nothing to fall back to.
+        # Fetch a few candidates and prefer an exact title match.
+        fallback_result = spotify_call(sp.search, q=title_query, type="track", limit=5)
+        uri = _best_title_match(fallback_result["tracks"]["items"], title)
+
+    if uri:
+        _track_cache_put(key, uri)
+    return uri
+
+
+def _best_title_match(items, title):
+    """Return the URI of the first item named `title` (case-insensitive), else of the first item."""
+    for item in items:
+        if item.get("name", "").lower().strip() == title:
+            return item["uri"]
+    return items[0]["uri"] if items else None
+
+
+# Persistent cache of resolved searches, shared by the search worker threads.
+# Only hits are stored: a miss today may resolve once the catalog changes.
+_track_cache = None
+_track_cache_lock = threading.Lock()
+
+
+def open_track_cache(path):
+    """Open (creating if needed) the SQLite track cache at `path`."""
+    global _track_cache
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS resolutions (key TEXT PRIMARY KEY, uri TEXT, ts INTEGER)")
+    conn.commit()
+    _track_cache = conn
+    return conn
+
+
+def close_track_cache():
+    global _track_cache
+    if _track_cache is not None:
+        _track_cache.close()
+        _track_cache = None
+
+
+def _track_cache_get(key):
+    if _track_cache is None:
+        return None
+    with _track_cache_lock:
+        row = _track_cache.execute("SELECT uri FROM resolutions WHERE key=?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _track_cache_put(key, uri):
+    if _track_cache is None:
+        return
+    with _track_cache_lock:
+        with _track_cache:
+            _track_cache.execute(
+                "INSERT OR REPLACE INTO resolutions (key, uri, ts) VALUES (?, ?, ?)",
+                (key, uri, int(time.time())),
+            )
+
 # -----------------------------
 # STEP 4: Create Playlists & Add Tracks
 # -----------------------------
-def create_spotify_playlists(sp, user_id, playlists):
-    missing_tracks = []
+def _submit_searches(pool, sp, tracks):
+    """Queue searches for `tracks` on the pool, returning futures in track order.
+
+    Tracks with a known Spotify URI (a spotify_uri column, or a URI/link in
+    the title or album) resolve immediately. Repeats of the same song within
+    a playlist share one future, so each
+    distinct (title, artist) is searched only once even while the first
+    search is still in flight.
+    """
+    by_key = {}
+    futures = []
+    for track in tracks:
+        # Rows that already carry a Spotify URI need no search at all
+        uri = _uri_from_text(track.spotify_uri, track.title, track.album)
+        if uri:
+            future = Future()
+            future.set_result(uri)
+            futures.append(future)
+            continue
+
+        key = _track_key(track.title, track.artist)
+        future = by_key.get(key)
+        if future is None:
+            # The key is already normalized, so skip search_track's own pass
+            future = by_key[key] = pool.submit(_search_normalized, sp, *key)
+        futures.append(future)
+    return futures
+
+
+def _add_batch(sp, playlist_id, playlist_name, uris, offset, stop):
+    try:
+        spotify_call(sp.playlist_add_items, playlist_id, uris, _rl_context={"playlist": playlist_name, "batch_index": offset})
+    except RateLimitCaptured:
+        # Tell the main loop and the other playlists' adders to stop
+        stop.set()
+        print("Stopped due to captured rate limit while adding tracks.")
+        raise
+
+
+class _PlaylistAdder:
+    """Sends one playlist's track batches, in order, on the shared add pool.
+
+    Spotify rejects positions past the current end of a playlist, so batches
+    of one playlist cannot be sent concurrently with explicit offsets. Queued
+    batches are instead sent one after another by a single task per playlist,
+    which keeps running while batches keep arriving; no worker ever waits on
+    another batch, so different playlists fill with up to ADD_CONCURRENCY
+    adds in flight.
+    """
 
-    for playlist_name, tracks in playlists.items():
-        print(f"\nCreating playlist: {playlist_name}")
-        # attach a small context so logs show which playlist we were creating
+    def __init__(self, pool, sp, playlist_id, playlist_name, stop):
+        self.pool = pool
+        self.sp = sp
+        self.playlist_id = playlist_id
+        self.playlist_name = playlist_name
+        self.stop = stop
+        self.batches = collections.deque()
+        self.added = 0
+        self.running = False
+        self.lock = threading.Lock()
+
+    def submit(self, uris):
+        """Queue a batch; returns the future of a newly started send task, if any."""
+        with self.lock:
+            self.batches.append((uris, self.added))
+            self.added += len(uris)
+            if self.running:
+                return None
+            self.running = True
+        return self.pool.submit(self._drain)
+
+    def _drain(self):
         try:
-            playlist = spotify_call(sp.user_playlist_create, user=user_id, name=playlist_name, public=False, _rl_context={"playlist": playlist_name})
-        except RateLimitCaptured:
-            print("Stopped due to captured rate limit while creating playlist.")
+            while True:
+                with self.lock:
+                    if not self.batches or self.stop.is_set():
+                        self.running = False
+                        return
+                    uris, offset = self.batches.popleft()
+                _add_batch(self.sp, self.playlist_id, self.playlist_name, uris, offset, self.stop)
+        except BaseException:
+            # Any failed add ends the run, not just a captured rate limit
+            self.stop.set()
+            with self.lock:
+                self.running = False
             raise
-        playlist_id = playlist["id"]
-
-        track_uris = []
-        for track in tracks:
-            uri = search_track(sp, track["title"], track["artist"])
-            if uri:
-                track_uris.append(uri)
-                print(f"✔ Found: {track['title']} by {track['artist']}")
-            else:
-                missing_tracks.append({
-                    "playlist": playlist_name,
-                    "title": track["title"],
-                    "artist": track["artist"],
-                    "reason": "Not found or title unknown"
-                })
-                print(f"✖ Missing: {track['title']} by {track['artist']}")
-
-        # Add tracks in batches of 100
-        for i in range(0, len(track_uris), 100):
-            try:
-                spotify_call(sp.playlist_add_items, playlist_id, track_uris[i:i+100], _rl_context={"playlist": playlist_name, "batch_index": i})
-            except RateLimitCaptured:
-                print("Stopped due to captured rate limit while adding tracks.")
-                raise
 
-    # Export missing tracks
-    with open(MISSING_TRACKS_FILE, "w", newline="", encoding="utf-8") as csvfile:
+
+def _raise_if_stopped(stop, add_futures):
+    """Re-raise the add failure that set `stop`, if any."""
+    if not stop.is_set():
+        return
+    # Other adders finish at most their current batch once stop is set
+    for future in add_futures:
+        future.result()
+    raise RateLimitCaptured("Stopped after a failed add")
+
+
+def create_spotify_playlists(sp, user_id, playlists, verbose=False):
+    """Create one Spotify playlist per parsed playlist and add the found tracks.
+
+    Per-track results are printed only when `verbose` is set; otherwise a
+    progress line is printed every PROGRESS_INTERVAL tracks to keep terminal
+    output (and its per-line flushing) off the hot loop.
+    """
+    # Track searches are independent network round-trips, so run them on a
+    # bounded pool of worker threads. The pool size caps how many requests are
+    # in flight at once to stay friendly with Spotify's rate limits.
+    #
+    # Work is pipelined: while a playlist's results are being consumed and
+    # added, the next playlist's searches are already queued, and tracks are
+    # added in batches of 100 as soon as each batch has resolved. Adds run on
+    # their own small pool, so different playlists are filled concurrently.
+    # A failed add sets `stop`, which is checked before every create and
+    # every batch so the run ends at the first captured rate limit.
+    names = list(playlists)
+    pending = {}
+    search_futures = []
+    add_futures = []
+    stop = threading.Event()
+
+    # Missing tracks are written as they are found, so a run that stops early
+    # (e.g. on a captured rate limit) still leaves a usable report.
+    missing_count = 0
+    with open(MISSING_TRACKS_FILE, "w", newline="", encoding="utf-8") as csvfile, \
+            ThreadPoolExecutor(max_workers=SEARCH_CONCURRENCY) as pool, \
+            ThreadPoolExecutor(max_workers=1) as create_pool, \
+            ThreadPoolExecutor(max_workers=ADD_CONCURRENCY) as add_pool:
         writer = csv.DictWriter(csvfile, fieldnames=["playlist", "title", "artist", "reason"])
         writer.writeheader()
-        writer.writerows(missing_tracks)
+        try:
+            for index, playlist_name in enumerate(names):
+                # Surface failures (e.g. a captured rate limit) from earlier adds
+                _raise_if_stopped(stop, add_futures)
+
+                tracks = playlists[playlist_name]
+                print(f"\nCreating playlist: {playlist_name}")
+                # Create the playlist on its own executor: the search pool may
+                # already hold this playlist's look-ahead searches, and a create
+                # queued behind them would hold back every add until they finish.
+                # attach a small context so logs show which playlist we were creating
+                create_future = create_pool.submit(spotify_call, sp.user_playlist_create, user=user_id, name=playlist_name, public=False, _rl_context={"playlist": playlist_name})
+                search_futures = pending.pop(playlist_name, None) or _submit_searches(pool, sp, tracks)
+
+                # Look ahead: queue the next playlist's searches behind this one's.
+                # Its creation is deferred until it becomes current, so a run
+                # aborted during the searches doesn't create it empty.
+                if index + 1 < len(names):
+                    upcoming = names[index + 1]
+                    pending[upcoming] = _submit_searches(pool, sp, playlists[upcoming])
+
+                try:
+                    playlist = create_future.result()
+                except RateLimitCaptured:
+                    print("Stopped due to captured rate limit while creating playlist.")
+                    raise
+                adder = _PlaylistAdder(add_pool, sp, playlist["id"], playlist_name, stop)
+
+                track_uris = []
+                found = 0
+                for position, (track, future) in enumerate(zip(tracks, search_futures), 1):
+                    uri = future.result()
+                    if uri:
+                        track_uris.append(uri)
+                        found += 1
+                        if verbose:
+                            print(f"✔ Found: {track.title} by {track.artist}")
+                    else:
+                        writer.writerow({
+                            "playlist": playlist_name,
+                            "title": track.title,
+                            "artist": track.artist,
+                            "reason": "Not found or title unknown"
+                        })
+                        missing_count += 1
+                        if missing_count % 100 == 0:
+                            csvfile.flush()
+                        if verbose:
+                            print(f"✖ Missing: {track.title} by {track.artist}")
+
+                    if not verbose and position % PROGRESS_INTERVAL == 0:
+                        print(f"  ... {position}/{len(tracks)} tracks searched")
+
+                    # Flush full batches of 100 while later searches are still running
+                    if len(track_uris) == 100:
+                        _raise_if_stopped(stop, add_futures)
+                        future = adder.submit(track_uris)
+                        if future is not None:
+                            add_futures.append(future)
+                        track_uris = []
+
+                if track_uris:
+                    _raise_if_stopped(stop, add_futures)
+                    future = adder.submit(track_uris)
+                    if future is not None:
+                        add_futures.append(future)
+                print(f"✔ {found} found, ✖ {len(tracks) - found} missing")
+
+            for future in add_futures:
+                future.result()
+        except BaseException:
+            # Don't leave queued searches and adds running after a failure;
+            # adders already sending stop after their current batch
+            stop.set()
+            for futures in [search_futures, add_futures, *pending.values()]:
+                for future in futures:
+                    future.cancel()
+            raise
 
     print(f"\n✅ All playlists processed! Missing tracks logged to {MISSING_TRACKS_FILE}")
 
@@ -320,10 +803,12 @@ if __name__ == "__main__":
     parser.add_argument("--input", "-i", default=INPUT_FILE, help="Path to CSV export file (default from env)")
     parser.add_argument("--delimiter", "-d", default=None, help="Delimiter used in the export file (default ';' or INPUT_DELIMITER env)")
     parser.add_argument("--export-only", dest="export_only", action="store_true", help="Only parse input and write JSON export, do not upload to Spotify")
+    parser.add_argument("--save-json", dest="save_json", action="store_true", help="Write the timestamped JSON export before uploading (implied by --export-only and --verbose)")
     parser.add_argument("--verbose", dest="verbose", action="store_true", help="Print diagnostics about encoding, delimiter and parsed counts")
     parser.add_argument("--confirm", dest="confirm", action="store_true", help="Skip interactive confirmation and proceed with uploading to Spotify")
     parser.add_argument("--stop-on-429", dest="stop_on_429", action="store_true", help="Stop and save rate-limit info on first observed 429")
     parser.add_argument("--rate-log-file", dest="rate_log_file", default=RATE_LIMIT_LOG, help="File to append rate-limit events (default: rate_limit_events.jsonl)")
+    parser.add_argument("--track-cache-file", dest="track_cache_file", default=TRACK_CACHE_FILE, help="SQLite file caching resolved track searches between runs (default: track_cache.db, empty to disable)")
     args = parser.parse_args()
 
     # Override runtime flags from CLI
@@ -338,28 +823,29 @@ if __name__ == "__main__":
     else:
         playlists = parse_playlist_export(args.input, delimiter=args.delimiter)
 
-    # Save JSON for reference. Write a timestamped file as the primary export
-    # (more human-readable timestamp) and optionally keep a non-timestamped
-    # "latest" copy for compatibility. Timestamp uses UTC timezone.
-    ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d_%H-%M-%SZ")
-    def _timestamped_path(path, ts):
-        base, ext = os.path.splitext(path)
-        if not ext:
-            ext = ".json"
-        return f"{base}_{ts}{ext}"
-
-    timestamped = _timestamped_path(JSON_EXPORT_FILE, ts)
-    # write timestamped primary file (only copy)
-    with open(timestamped, "w", encoding="utf-8") as f:
-        json.dump(playlists, f, indent=2)
-
-    export_path = timestamped
-    if args.verbose:
-        print(f"Saved timestamped JSON export to {export_path}")
-
-    if args.export_only:
-        print(f"Exported parsed playlists to {export_path}. Exiting (export-only mode).")
-        raise SystemExit(0)
+    # Save JSON for reference when asked for (or implied by --export-only /
+    # --verbose); a plain upload skips the serialization entirely. Write a
+    # timestamped file as the primary export (more human-readable timestamp).
+    # Timestamp uses UTC timezone.
+    if args.export_only or args.verbose or args.save_json:
+        ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d_%H-%M-%SZ")
+        def _timestamped_path(path, ts):
+            base, ext = os.path.splitext(path)
+            if not ext:
+                ext = ".json"
+            return f"{base}_{ts}{ext}"
+
+        timestamped = _timestamped_path(JSON_EXPORT_FILE, ts)
+        # write timestamped primary file (only copy)
+        write_json_export(playlists, timestamped)
+
+        export_path = timestamped
+        if args.verbose:
+            print(f"Saved timestamped JSON export to {export_path}")
+
+        if args.export_only:
+            print(f"Exported parsed playlists to {export_path}. Exiting (export-only mode).")
+            raise SystemExit(0)
 
     # If confirmation not explicitly provided, pretty-print a summary and ask the user
     def pretty_print_summary(playlists, limit=10):
@@ -389,6 +875,8 @@ if __name__ == "__main__":
     start_time = time.time()  # Start the timer
 
     sp = authenticate_spotify()
+    if args.track_cache_file:
+        open_track_cache(args.track_cache_file)
     try:
         user_id = spotify_call(sp.current_user)["id"]
     except RateLimitCaptured:
@@ -396,9 +884,11 @@ if __name__ == "__main__":
         raise
 
     try:
-        create_spotify_playlists(sp, user_id, playlists)
+        create_spotify_playlists(sp, user_id, playlists, verbose=args.verbose)
     except RateLimitCaptured:
         print(f"A rate limit was captured. Details were appended to {RATE_LIMIT_LOG}")
+    finally:
+        close_track_cache()
 
     end_time = time.time()  # End the timer
     elapsed_time = end_time - start_time
@@ -0,0 +1,72 @@
+"""Row parsing hot loop for export_to_spotify.
+
+This module is fully type-annotated so it can be compiled with mypyc
+(``pip install mypy && mypyc fast_parse.py``); the compiled extension is
+then picked up automatically in place of this file. Rebuild (or delete) the
+extension after editing this file, or the stale compiled copy wins.
+
+Compiling does not currently pay off: the loop is dominated by C-level
+string splitting/stripping and tuple allocation, which mypyc cannot speed
+up. On a 32 MB / 581k-row export the pure-Python loop takes ~0.55 s and
+the mypyc build ~0.54 s (the previous csv.reader-based loop: ~1.1 s either
+way; the original readlines()/dict loop: ~0.75 s).
+"""
+import gc
+import re
+from typing import Dict, Iterable, List, NamedTuple
+
+# Spotify track URIs or open.spotify.com links (optionally with an intl-xx segment)
+SPOTIFY_TRACK_RE = re.compile(r"spotify:track:([A-Za-z0-9]{22})|open\.spotify\.com/(?:[\w-]+/)?track/([A-Za-z0-9]{22})")
+
+
+class Track(NamedTuple):
+    """A parsed track. Much smaller than a per-row dict, which adds up on
+    libraries with tens of thousands of tracks."""
+    title: str
+    artist: str
+    album: str
+    spotify_uri: str = ""
+
+
+# Track(...) goes through a Python-level __new__; building the tuple directly
+# is more than twice as fast per row.
+_new_tuple = tuple.__new__
+
+
+def parse_lines(lines: Iterable[str], delimiter: str) -> Dict[str, List[Track]]:
+    """Group `playlist;title;artist;album[;spotify_uri]` lines into playlists.
+
+    Lines that do not have four or five fields are skipped, as are five-field
+    lines whose last field is not empty or a Spotify track URI/link (most
+    likely a stray delimiter inside a title). Fields are stripped of
+    surrounding whitespace.
+    """
+    # Every row allocates a tracked tuple, so the cyclic GC would otherwise
+    # run repeatedly over the growing result; nothing here creates cycles.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        playlists: Dict[str, List[Track]] = {}
+        track_type = Track
+        for line in lines:
+            row = line.split(delimiter)
+            fields = len(row)
+            if fields == 4:
+                spotify_uri = ""
+            elif fields == 5:
+                spotify_uri = row[4].strip()
+                if spotify_uri and SPOTIFY_TRACK_RE.search(spotify_uri) is None:
+                    continue
+            else:
+                continue
+            playlist_name = row[0].strip()
+            track = _new_tuple(track_type, (row[1].strip(), row[2].strip(), row[3].strip(), spotify_uri))
+            tracks = playlists.get(playlist_name)
+            if tracks is None:
+                playlists[playlist_name] = [track]
+            else:
+                tracks.append(track)
+        return playlists
+    finally:
+        if gc_was_enabled:
+            gc.enable()
@@ -1,4 +1,5 @@
 import os
+import time
 import importlib
 
 import pytest
@@ -21,8 +22,38 @@ def test_parse_music_export(tmp_path):
 
     assert "MyPlaylist" in playlists
     assert len(playlists["MyPlaylist"]) == 2
-    assert playlists["MyPlaylist"][0]["title"] == "Song A"
-    assert playlists["OtherPlaylist"][0]["artist"] == "Artist B"
+    assert playlists["MyPlaylist"][0].title == "Song A"
+    assert playlists["OtherPlaylist"][0].artist == "Artist B"
+
+
+def test_parse_playlist_export_strips_bom(tmp_path):
+    f = tmp_path / "export.csv"
+    f.write_bytes("A;Song;Artist;Album\n".encode("utf-8-sig"))
+
+    playlists, meta = exs.parse_playlist_export(str(f), delimiter=";", return_meta=True)
+    assert list(playlists) == ["A"]
+    assert meta["encoding"] == "utf-8"
+
+
+def test_parse_playlist_export_does_not_retry_sniffed_encoding(tmp_path, monkeypatch):
+    # ASCII-only sample, with a cp1252 byte only after the 64 KB sniffed head
+    f = tmp_path / "export.csv"
+    f.write_bytes(b"P;Song;Artist;Album\n" * 5000 + b"P;Caf\xe9;Artist;Album\n")
+
+    opened = []
+    real_open_text = exs._open_text
+
+    def recording_open_text(path, encoding, errors="strict"):
+        opened.append(encoding)
+        return real_open_text(path, encoding, errors)
+
+    monkeypatch.setattr(exs, "_open_text", recording_open_text)
+    playlists, meta = exs.parse_playlist_export(str(f), delimiter=";", return_meta=True)
+
+    assert meta["encoding"] == "cp1252"
+    assert playlists["P"][-1].title == "Café"
+    if exs.charset_normalizer is not None:
+        assert opened == ["utf-8", "cp1252"]
 
 
 def test_search_track_found_and_fallback():
@@ -48,6 +79,103 @@ def test_search_track_found_and_fallback():
     assert uri2 == "spotify:track:456"
 
 
+def test_search_track_fallback_only_when_artist_known():
+    class MockSpEmpty:
+        def __init__(self):
+            self.queries = []
+
+        def search(self, q, type, limit):
+            self.queries.append(q)
+            return {"tracks": {"items": []}}
+
+    sp = MockSpEmpty()
+    assert exs.search_track(sp, "Lonely Song", "unknown") is None
+    # The primary query is already title-only, so no fallback is issued
+    assert sp.queries == ["track:lonely song"]
+
+    class MockSpCandidates:
+        def search(self, q, type, limit):
+            if "artist:" in q:
+                return {"tracks": {"items": []}}
+            return {"tracks": {"items": [
+                {"uri": "spotify:track:cover", "name": "Lonely Song (Cover)"},
+                {"uri": "spotify:track:exact", "name": "Lonely Song"},
+            ]}}
+
+    assert exs.search_track(MockSpCandidates(), "Lonely Song", "Someone") == "spotify:track:exact"
+
+
+def test_search_track_caches_repeated_queries():
+    class MockSp:
+        def __init__(self):
+            self.calls = 0
+
+        def search(self, q, type, limit):
+            self.calls += 1
+            return {"tracks": {"items": [{"uri": "spotify:track:789"}]}}
+
+    sp = MockSp()
+    assert exs.search_track(sp, "Song C", "Artist C") == "spotify:track:789"
+    # Same song with different casing/whitespace should be served from the cache
+    assert exs.search_track(sp, " song c ", "ARTIST C") == "spotify:track:789"
+    assert sp.calls == 1
+
+
+def test_search_track_uses_disk_cache_between_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(exs, "_track_cache", None)
+
+    class MockSp:
+        def __init__(self):
+            self.calls = 0
+
+        def search(self, q, type, limit):
+            self.calls += 1
+            return {"tracks": {"items": [{"uri": "spotify:track:disk"}]}}
+
+    exs.open_track_cache(str(tmp_path / "cache.db"))
+    try:
+        first = MockSp()
+        assert exs.search_track(first, "Song D", "Artist D") == "spotify:track:disk"
+
+        # A fresh client (as in a new run) should be answered from disk
+        second = MockSp()
+        assert exs.search_track(second, "Song D", "Artist D") == "spotify:track:disk"
+        assert second.calls == 0
+    finally:
+        exs.close_track_cache()
+
+
+def test_spotify_uri_rows_skip_search(tmp_path):
+    track_id = "4uLU6hMCjMI75M1A2tKUQC"
+    data = (
+        f"Mixed;Song A;Artist A;Album A;spotify:track:{track_id}\n"
+        "Mixed;Song B;Artist B;Album B\n"
+    )
+    f = tmp_path / "export.csv"
+    f.write_text(data, encoding="utf-8")
+
+    playlists = exs.parse_playlist_export(str(f), delimiter=";")
+    assert [t.spotify_uri for t in playlists["Mixed"]] == [f"spotify:track:{track_id}", ""]
+    assert "spotify_uri" not in exs.serialize_playlists(playlists)["Mixed"][1]
+
+    # A link pasted into the title resolves without touching the client
+    link = f"https://open.spotify.com/intl-de/track/{track_id}?si=abc"
+    assert exs.search_track(None, link, "Artist") == f"spotify:track:{track_id}"
+
+
+def test_five_field_rows_without_uri_are_skipped(tmp_path):
+    # A stray delimiter inside a title must not shift fields into the wrong slots
+    data = (
+        "A;Title; part;Artist;Album\n"
+        "A;Good Song;Artist;Album;\n"
+    )
+    f = tmp_path / "export.csv"
+    f.write_text(data, encoding="utf-8")
+
+    playlists = exs.parse_playlist_export(str(f), delimiter=";")
+    assert playlists["A"] == [exs.Track("Good Song", "Artist", "Album", "")]
+
+
 def test_search_track_no_title():
     # None or empty or 'unknown' should return None
     assert exs.search_track(None, "", None) is None
@@ -55,12 +183,58 @@ def test_search_track_no_title():
     assert exs.search_track(None, "unknown", "Artist") is None
 
 
+def test_get_retry_after_from_exception():
+    class HeaderExc(Exception):
+        headers = {"retry-after": "3"}
+
+    assert exs._get_retry_after_from_exception(HeaderExc()) == 3
+    assert exs._get_retry_after_from_exception(Exception("429: Retry-After 7")) == 7
+    assert exs._get_retry_after_from_exception(Exception("boom")) is None
+
+
+def test_token_bucket_burst_and_throttle(monkeypatch):
+    bucket = exs.TokenBucket(rate=10, burst=2)
+    sleeps = []
+    monkeypatch.setattr(exs.time, "sleep", lambda s: (sleeps.append(s), setattr(bucket, "tokens", 1)))
+
+    bucket.acquire()
+    bucket.acquire()
+    assert sleeps == []
+    # Burst exhausted: the third request has to wait for a refill
+    bucket.acquire()
+    assert len(sleeps) == 1 and sleeps[0] > 0
+
+    bucket.throttle()
+    assert bucket.rate == pytest.approx(5, rel=0.01)
+
+
+def test_token_bucket_throttle_is_debounced(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(exs.time, "monotonic", lambda: clock[0])
+    bucket = exs.TokenBucket(rate=16, burst=2)
+
+    # Ten workers hitting the same 429 only halve the rate once
+    for _ in range(10):
+        bucket.throttle()
+    assert bucket.rate == pytest.approx(8)
+
+    # A rate limit after the window has passed throttles again
+    clock[0] += 1.5
+    bucket.throttle()
+    assert bucket.rate == pytest.approx(4, rel=0.01)
+
+    # A longer window (e.g. from Retry-After) extends the debounce
+    clock[0] += 1.5
+    bucket.throttle(window=5)
+    assert bucket.rate > 4
+
+
 def test_create_spotify_playlists_records_missing_and_adds_tracks(tmp_path, monkeypatch):
     # Create a small playlists structure
     playlists = {
         "MyList": [
-            {"title": "FoundSong", "artist": "A"},
-            {"title": "MissingSong", "artist": "B"},
+            exs.Track("FoundSong", "A", ""),
+            exs.Track("MissingSong", "B", ""),
         ]
     }
 
@@ -80,13 +254,13 @@ def test_create_spotify_playlists_records_missing_and_adds_tracks(tmp_path, monk
 
     sp = MockSp()
 
-    # Monkeypatch the search_track function in the module to control results
-    def fake_search_track(sp_obj, title, artist=None):
-        if title == "FoundSong":
+    # Monkeypatch the search in the module to control results (keys arrive normalized)
+    def fake_search_track(sp_obj, title, artist):
+        if title == "foundsong":
             return "spotify:track:found"
         return None
 
-    monkeypatch.setattr(exs, "search_track", fake_search_track)
+    monkeypatch.setattr(exs, "_search_normalized", fake_search_track)
 
     # Redirect missing tracks file to a temp path
     tmp_missing = tmp_path / "missing.csv"
@@ -105,7 +279,175 @@ def test_create_spotify_playlists_records_missing_and_adds_tracks(tmp_path, monk
     assert "MissingSong" in content
 
 
-def test_create_json_export_from_test_file(tmp_path, monkeypatch):
+def test_create_spotify_playlists_batches_in_order(tmp_path, monkeypatch):
+    playlists = {
+        "First": [exs.Track(f"Song {i}", "A", "") for i in range(150)],
+        "Second": [exs.Track("Other", "B", "")],
+    }
+
+    class MockSp:
+        def __init__(self):
+            self.added = []
+
+        def user_playlist_create(self, user, name, public):
+            return {"id": name}
+
+        def playlist_add_items(self, playlist_id, uris):
+            self.added.append((playlist_id, list(uris)))
+
+    monkeypatch.setattr(exs, "_search_normalized", lambda sp_obj, title, artist: f"spotify:track:{title}")
+    monkeypatch.setattr(exs, "MISSING_TRACKS_FILE", str(tmp_path / "missing.csv"))
+
+    sp = MockSp()
+    exs.create_spotify_playlists(sp, "testuser", playlists)
+
+    # Different playlists may be filled concurrently; batches within one stay ordered
+    first = [uris for pid, uris in sp.added if pid == "First"]
+    second = [uris for pid, uris in sp.added if pid == "Second"]
+    assert [len(uris) for uris in first] == [100, 50]
+    assert first[0] + first[1] == [f"spotify:track:song {i}" for i in range(150)]
+    assert second == [["spotify:track:other"]]
+
+
+def test_create_spotify_playlists_stops_after_rate_limited_add(tmp_path, monkeypatch):
+    import threading
+
+    playlists = {f"P{i}": [exs.Track(f"Song {i}", "A", "")] for i in range(1, 6)}
+    add_failed = threading.Event()
+    created = []
+    added = []
+
+    class MockSp:
+        def user_playlist_create(self, user, name, public):
+            created.append(name)
+            if name != "P1":
+                add_failed.wait(timeout=2)
+            return {"id": name}
+
+        def playlist_add_items(self, playlist_id, uris):
+            added.append(playlist_id)
+            add_failed.set()
+            raise exs.RateLimitCaptured("captured")
+
+    monkeypatch.setattr(exs, "_search_normalized", lambda sp_obj, title, artist: f"spotify:track:{title}")
+    monkeypatch.setattr(exs, "MISSING_TRACKS_FILE", str(tmp_path / "missing.csv"))
+
+    with pytest.raises(exs.RateLimitCaptured):
+        exs.create_spotify_playlists(MockSp(), "testuser", playlists)
+
+    # The create already in flight may finish, but nothing after it is created or filled
+    assert created[0] == "P1" and len(created) <= 2
+    assert added == ["P1"]
+
+
+def test_create_spotify_playlists_adds_playlists_concurrently(tmp_path, monkeypatch):
+    import threading
+
+    playlists = {f"P{i}": [exs.Track(f"Song {i}-{j}", "A", "") for j in range(500)] for i in range(4)}
+    lock = threading.Lock()
+    in_flight = [0]
+    max_in_flight = [0]
+    added = {}
+
+    class MockSp:
+        def user_playlist_create(self, user, name, public):
+            return {"id": name}
+
+        def playlist_add_items(self, playlist_id, uris):
+            with lock:
+                in_flight[0] += 1
+                max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+                added.setdefault(playlist_id, []).extend(uris)
+
+    monkeypatch.setattr(exs, "ADD_CONCURRENCY", 4)
+    # Don't let request pacing (or throttling left by other tests) serialize the adds
+    monkeypatch.setattr(exs, "_rate_limiter", exs.TokenBucket(rate=0, burst=1))
+    monkeypatch.setattr(exs, "_search_normalized", lambda sp_obj, title, artist: f"spotify:track:{title}")
+    monkeypatch.setattr(exs, "MISSING_TRACKS_FILE", str(tmp_path / "missing.csv"))
+
+    exs.create_spotify_playlists(MockSp(), "testuser", playlists)
+
+    # No add worker sits waiting on another batch, so every playlist fills at once
+    assert max_in_flight[0] == 4
+    for name, tracks in playlists.items():
+        assert added[name] == [f"spotify:track:{t.title.lower()}" for t in tracks]
+
+
+def test_create_spotify_playlists_creates_before_searches_finish(tmp_path, monkeypatch):
+    import threading
+
+    playlists = {
+        "First": [exs.Track("First song", "A", "")],
+        "Second": [exs.Track(f"Second {i}", "B", "") for i in range(6)],
+    }
+    second_created = threading.Event()
+    waits = []
+
+    class MockSp:
+        def user_playlist_create(self, user, name, public):
+            if name == "Second":
+                second_created.set()
+            return {"id": name}
+
+        def playlist_add_items(self, playlist_id, uris):
+            pass
+
+    def fake_search_track(sp_obj, title, artist):
+        if title.startswith("second"):
+            # Look-ahead searches hold every search worker until "Second" exists
+            waits.append(second_created.wait(timeout=2))
+        return f"spotify:track:{title}"
+
+    monkeypatch.setattr(exs, "SEARCH_CONCURRENCY", 2)
+    monkeypatch.setattr(exs, "_search_normalized", fake_search_track)
+    monkeypatch.setattr(exs, "MISSING_TRACKS_FILE", str(tmp_path / "missing.csv"))
+
+    exs.create_spotify_playlists(MockSp(), "testuser", playlists)
+
+    assert waits and all(waits)
+
+
+def test_create_spotify_playlists_searches_duplicates_once(tmp_path, monkeypatch):
+    playlists = {
+        "Dupes": [
+            exs.Track("Song", "Artist", ""),
+            exs.Track("song ", "ARTIST", ""),
+            exs.Track("Other", "Artist", ""),
+        ]
+    }
+
+    class MockSp:
+        def __init__(self):
+            self.added = []
+
+        def user_playlist_create(self, user, name, public):
+            return {"id": "pl"}
+
+        def playlist_add_items(self, playlist_id, uris):
+            self.added.extend(uris)
+
+    searched = []
+
+    def fake_search_track(sp_obj, title, artist):
+        searched.append(title)
+        return f"spotify:track:{title}"
+
+    monkeypatch.setattr(exs, "_search_normalized", fake_search_track)
+    monkeypatch.setattr(exs, "MISSING_TRACKS_FILE", str(tmp_path / "missing.csv"))
+
+    sp = MockSp()
+    exs.create_spotify_playlists(sp, "testuser", playlists)
+
+    assert sorted(searched) == ["other", "song"]
+    # Duplicates are still added once per occurrence, in order
+    assert sp.added == ["spotify:track:song", "spotify:track:song", "spotify:track:other"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_create_json_export_from_test_file(tmp_path, monkeypatch, use_orjson):
     """Verify the script can parse the bundled test_export_300.csv and save a JSON export."""
     data_path = Path(exs.__file__).parent / "test_export_300.csv"
     assert data_path.exists(), f"test file not found at {data_path}"
@@ -117,10 +459,13 @@ def test_create_json_export_from_test_file(tmp_path, monkeypatch):
     out = tmp_path / "export.json"
     # monkeypatch module constant and perform the same save behavior as main
     monkeypatch.setattr(exs, "JSON_EXPORT_FILE", str(out))
+    if not use_orjson:
+        monkeypatch.setattr(exs, "orjson", None)
 
-    with open(exs.JSON_EXPORT_FILE, "w", encoding="utf-8") as f:
-        json.dump(playlists, f, indent=2)
+    exs.write_json_export(playlists, exs.JSON_EXPORT_FILE)
 
     assert out.exists()
     loaded = json.loads(out.read_text(encoding="utf-8"))
-    assert loaded == playlists
+    assert loaded == exs.serialize_playlists(playlists)
+    first = next(iter(loaded.values()))[0]
+    assert set(first) == {"title", "artist", "album"}